@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 编解码
+安装了 orjson 时使用 orjson，否则回退到标准库 json
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def dumps(data, indent: bool = False) -> bytes:
+        """序列化为 UTF-8 字节，默认紧凑格式，indent 时缩进 2 空格"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    def loads(data):
+        """解析 JSON（str 或 bytes）"""
+        return orjson.loads(data)
+else:
+    def dumps(data, indent: bool = False) -> bytes:
+        """序列化为 UTF-8 字节，默认紧凑格式，indent 时缩进 2 空格"""
+        if indent:
+            return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(data):
+        """解析 JSON（str 或 bytes）"""
+        return json.loads(data)
+
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种实现都可以这样捕获
+JSONDecodeError = json.JSONDecodeError
@@ -7,43 +7,283 @@
 
 import json
 import os
+import shutil
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from _fastjson import dumps, loads, JSONDecodeError
+
 
 class AssetPool:
     """资产池管理器"""
     
+    # 执行日志中超出执行数的事件行数达到该值时，加载时压缩为快照
+    COMPACT_THRESHOLD = 1000
+    
     def __init__(self, data_dir: str = None):
         self.data_dir = data_dir or os.path.expanduser('~/.openclaw/workspace/memory/money-ideas')
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # 灵感会被频繁修改，整体保存为 JSON；执行和收益只追加，使用 JSON Lines
         self.ideas_file = os.path.join(self.data_dir, 'ideas.json')
-        self.execution_file = os.path.join(self.data_dir, 'executions.json')
-        self.revenue_file = os.path.join(self.data_dir, 'revenue.json')
+        self.execution_file = os.path.join(self.data_dir, 'executions.jsonl')
+        self.revenue_file = os.path.join(self.data_dir, 'revenue.jsonl')
+        
+        # 灵感是否待写盘 / 待追加的记录；autoflush 关闭时由 flush() 统一写入
+        self._ideas_dirty = False
+        self._pending = defaultdict(list)
+        self._autoflush = True
+        
+        # 数据文件在首次访问时才加载，只用到一类数据时不必解析其它文件
+        self._ideas = None
+        self._executions = None
+        self._revenues = None
+    
+    def _ensure_ideas(self):
+        """加载灵感并建立 id 索引"""
+        if self._ideas is None:
+            self._ideas = self._load_json(self.ideas_file, [])
+            self._idea_by_id = {i['id']: i for i in self._ideas}
+    
+    def _ensure_executions(self):
+        """加载执行记录并建立 id 索引"""
+        if self._executions is None:
+            self._executions = self._load_executions()
+            self._exec_by_id = {e['id']: e for e in self._executions}
+    
+    def _ensure_revenues(self):
+        """加载收益记录并按灵感建立索引"""
+        if self._revenues is None:
+            self._revenues = self._load_jsonl(
+                self.revenue_file, os.path.join(self.data_dir, 'revenue.json'))
+            self._rev_by_idea = defaultdict(list)
+            for r in self._revenues:
+                self._rev_by_idea[r['idea_id']].append(r)
+    
+    @property
+    def ideas(self) -> List[Dict]:
+        """灵感列表"""
+        self._ensure_ideas()
+        return self._ideas
+    
+    @property
+    def executions(self) -> List[Dict]:
+        """执行记录列表"""
+        self._ensure_executions()
+        return self._executions
+    
+    @property
+    def revenues(self) -> List[Dict]:
+        """收益记录列表"""
+        self._ensure_revenues()
+        return self._revenues
+    
+    def _load_executions(self) -> List[Dict]:
+        """
+        加载执行记录
+        
+        executions.jsonl 每行是一个事件：
+            {"event": "start", "exec": {...}}        新建执行（或压缩后的快照）
+            {"event": "step", "id": ..., "data": {...}}
+            {"event": "log", "id": ..., "data": {...}}
+            {"event": "complete", "id": ..., "data": {...}}
+        按顺序回放得到当前状态。
+        """
+        legacy_file = os.path.join(self.data_dir, 'executions.json')
+        if not os.path.exists(self.execution_file) and os.path.exists(legacy_file):
+            executions = self._load_json(legacy_file, [])
+            self._save_jsonl(self.execution_file, [self._exec_snapshot(e) for e in executions])
+            return executions
+        
+        events = self._load_jsonl(self.execution_file)
+        executions = []
+        by_id = {}
+        for event in events:
+            kind = event.get('event')
+            if kind == 'start':
+                execution = event['exec']
+                executions.append(execution)
+                by_id[execution['id']] = execution
+                continue
+            
+            execution = by_id.get(event.get('id'))
+            if execution is None:
+                continue
+            if kind == 'step':
+                execution['steps'].append(event['data'])
+            elif kind == 'log':
+                execution['logs'].append(event['data'])
+            elif kind == 'complete':
+                execution.update(event['data'])
+        
+        # 事件过多时压缩为每个执行一行快照
+        if len(events) - len(executions) >= self.COMPACT_THRESHOLD:
+            self._save_jsonl(self.execution_file, [self._exec_snapshot(e) for e in executions])
         
-        self._load_data()
+        return executions
     
-    def _load_data(self):
-        """加载数据"""
-        self.ideas = self._load_json(self.ideas_file, [])
-        self.executions = self._load_json(self.execution_file, [])
-        self.revenues = self._load_json(self.revenue_file, [])
+    @staticmethod
+    def _exec_snapshot(execution: Dict) -> Dict:
+        """执行记录的快照事件"""
+        return {'event': 'start', 'exec': execution}
     
     def _load_json(self, filepath: str, default):
         """加载 JSON 文件"""
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return default
-        return default
+        try:
+            with open(filepath, 'rb') as f:
+                return loads(f.read())
+        except FileNotFoundError:
+            return default
+        except ValueError as e:
+            # JSON 损坏或编码不是 UTF-8（UnicodeDecodeError）
+            # 保留损坏的文件，避免下次写盘时覆盖掉
+            backup = self._corrupt_path(filepath)
+            os.replace(filepath, backup)
+            print(f"数据文件损坏，已备份为 {backup}: {e}")
+            return default
+    
+    @staticmethod
+    def _corrupt_path(filepath: str) -> str:
+        """损坏文件的备份路径：带时间戳，已存在时加序号，不覆盖之前的备份"""
+        base = f"{filepath}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        backup = base
+        n = 1
+        while os.path.exists(backup):
+            backup = f"{base}-{n}"
+            n += 1
+        return backup
+    
+    def _load_jsonl(self, filepath: str, legacy_file: str = None) -> List[Dict]:
+        """
+        加载 JSON Lines 文件
+        
+        Args:
+            filepath: JSONL 文件路径
+            legacy_file: 旧版 JSON 文件路径，JSONL 不存在时从中迁移
+            
+        Returns:
+            记录列表
+        """
+        if not os.path.exists(filepath):
+            if legacy_file and os.path.exists(legacy_file):
+                records = self._load_json(legacy_file, [])
+                self._save_jsonl(filepath, records)
+                return records
+            return []
+        
+        records = []
+        bad_lines = []
+        last_line = 0
+        with open(filepath, 'rb') as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                last_line = lineno
+                try:
+                    records.append(loads(line))
+                except (JSONDecodeError, UnicodeDecodeError):
+                    bad_lines.append(lineno)
+        
+        if bad_lines:
+            # 只有最后一行损坏是写入中断留下的残行，可以直接丢弃；
+            # 其它位置的坏行说明文件被破坏，先备份再重写
+            if bad_lines != [last_line]:
+                backup = self._corrupt_path(filepath)
+                shutil.copyfile(filepath, backup)
+                lines = ', '.join(map(str, bad_lines))
+                print(f"数据文件第 {lines} 行损坏，已备份为 {backup}")
+            # 重写去掉坏行，否则后续追加会接在残行后面
+            self._save_jsonl(filepath, records)
+        
+        return records
+    
+    def _write_atomic(self, filepath: str, content: bytes):
+        """先写临时文件再原子替换，写入中途崩溃不会留下半个文件"""
+        tmp = filepath + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filepath)
     
     def _save_json(self, filepath: str, data):
         """保存 JSON 文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_atomic(filepath, dumps(data))
+    
+    def _save_jsonl(self, filepath: str, records: List[Dict]):
+        """整体重写 JSON Lines 文件"""
+        self._write_atomic(filepath, b''.join(dumps(r) + b'\n' for r in records))
+    
+    def _append_jsonl(self, filepath: str, lines: List[bytes]):
+        """向 JSON Lines 文件追加已序列化的行（一次 write）"""
+        with open(filepath, 'ab') as f:
+            f.write(b''.join(lines))
+    
+    def _mark_ideas_dirty(self):
+        """标记灵感需要写盘"""
+        self._ideas_dirty = True
+        if self._autoflush:
+            self.flush()
+    
+    def _append_record(self, filepath: str, record: Dict):
+        """登记一条待追加的记录"""
+        # 立即序列化，避免记录在 flush 前被修改
+        self._pending[filepath].append(dumps(record) + b'\n')
+        if self._autoflush:
+            self.flush()
+    
+    def flush(self):
+        """将所有待写盘的数据写入文件"""
+        if self._ideas_dirty:
+            self._save_json(self.ideas_file, self.ideas)
+            self._ideas_dirty = False
+        
+        for filepath, lines in self._pending.items():
+            self._append_jsonl(filepath, lines)
+        self._pending.clear()
+    
+    @contextmanager
+    def batch(self):
+        """
+        批量修改，退出时只写一次盘
+        
+        用法：
+            with pool.batch():
+                pool.add_execution_step(exec_id, '步骤1')
+                pool.add_execution_step(exec_id, '步骤2')
+        """
+        autoflush = self._autoflush
+        self._autoflush = False
+        try:
+            yield self
+        finally:
+            self._autoflush = autoflush
+            if autoflush:
+                self.flush()
+    
+    @staticmethod
+    def _now_iso() -> str:
+        """当前时间的 ISO 字符串（精确到微秒，同一秒内创建的灵感也能按时间排序）"""
+        return datetime.now().isoformat()
+    
+    def _find_idea(self, idea_id: str) -> Optional[Dict]:
+        """按 ID 查找灵感（O(1)），不存在返回 None"""
+        self._ensure_ideas()
+        return self._idea_by_id.get(idea_id)
+    
+    def _find_exec(self, exec_id: str) -> Optional[Dict]:
+        """按 ID 查找执行记录（O(1)），不存在返回 None"""
+        self._ensure_executions()
+        return self._exec_by_id.get(exec_id)
+    
+    @staticmethod
+    def _new_id(prefix: str) -> str:
+        """生成唯一 ID（同一秒内多次生成也不会冲突）"""
+        return f"{prefix}-{uuid.uuid4().hex[:12]}"
     
     # === 灵感池 ===
     
@@ -57,24 +297,22 @@ class AssetPool:
         Returns:
             灵感 ID
         """
-        idea_id = f"idea-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        idea_id = self._new_id('idea')
         idea['id'] = idea_id
-        idea['created_at'] = datetime.now().isoformat()
+        idea['created_at'] = self._now_iso()
         idea['status'] = 'pending'  # pending, in_progress, completed, failed
         idea['score'] = 0  # 潜力分数
         idea['tags'] = idea.get('tags', [])
         
         self.ideas.append(idea)
-        self._save_json(self.ideas_file, self.ideas)
+        self._idea_by_id[idea_id] = idea
+        self._mark_ideas_dirty()
         
         return idea_id
     
     def get_idea(self, idea_id: str) -> Optional[Dict]:
         """获取灵感"""
-        for idea in self.ideas:
-            if idea['id'] == idea_id:
-                return idea
-        return None
+        return self._find_idea(idea_id)
     
     def list_ideas(self, status: str = None, limit: int = 10) -> List[Dict]:
         """
@@ -97,17 +335,26 @@ class AssetPool:
         
         return ideas[:limit]
     
-    def update_idea_status(self, idea_id: str, status: str, notes: str = None):
-        """更新灵感状态"""
-        for idea in self.ideas:
-            if idea['id'] == idea_id:
-                idea['status'] = status
-                idea['updated_at'] = datetime.now().isoformat()
-                if notes:
-                    idea['notes'] = notes
-                self._save_json(self.ideas_file, self.ideas)
-                return True
-        return False
+    def update_idea_status(self, idea_id: str, status: str, notes: str = None, now: str = None):
+        """
+        更新灵感状态
+        
+        Args:
+            idea_id: 灵感 ID
+            status: 新状态
+            notes: 备注
+            now: 更新时间（ISO 字符串），由调用方传入以复用同一时间戳
+        """
+        idea = self._find_idea(idea_id)
+        if idea is None:
+            return False
+        
+        idea['status'] = status
+        idea['updated_at'] = now or self._now_iso()
+        if notes:
+            idea['notes'] = notes
+        self._mark_ideas_dirty()
+        return True
     
     # === 执行跟踪 ===
     
@@ -121,66 +368,77 @@ class AssetPool:
         Returns:
             执行 ID
         """
-        exec_id = f"exec-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        exec_id = self._new_id('exec')
+        now = self._now_iso()
         
         execution = {
             'id': exec_id,
             'idea_id': idea_id,
-            'started_at': datetime.now().isoformat(),
+            'started_at': now,
             'status': 'in_progress',
             'steps': [],
             'logs': [],
         }
         
         self.executions.append(execution)
-        self._save_json(self.execution_file, self.executions)
+        self._exec_by_id[exec_id] = execution
+        self._append_record(self.execution_file, self._exec_snapshot(execution))
         
         # 更新灵感状态
-        self.update_idea_status(idea_id, 'in_progress')
+        self.update_idea_status(idea_id, 'in_progress', now=now)
         
         return exec_id
     
     def add_execution_step(self, exec_id: str, step: str, status: str = 'completed'):
         """添加执行步骤"""
-        for execution in self.executions:
-            if execution['id'] == exec_id:
-                execution['steps'].append({
-                    'step': step,
-                    'status': status,
-                    'timestamp': datetime.now().isoformat(),
-                })
-                self._save_json(self.execution_file, self.executions)
-                return True
-        return False
+        execution = self._find_exec(exec_id)
+        if execution is None:
+            return False
+        
+        data = {
+            'step': step,
+            'status': status,
+            'timestamp': self._now_iso(),
+        }
+        execution['steps'].append(data)
+        self._append_record(self.execution_file, {'event': 'step', 'id': exec_id, 'data': data})
+        return True
     
     def add_execution_log(self, exec_id: str, log: str):
         """添加执行日志"""
-        for execution in self.executions:
-            if execution['id'] == exec_id:
-                execution['logs'].append({
-                    'log': log,
-                    'timestamp': datetime.now().isoformat(),
-                })
-                self._save_json(self.execution_file, self.executions)
-                return True
-        return False
+        execution = self._find_exec(exec_id)
+        if execution is None:
+            return False
+        
+        data = {
+            'log': log,
+            'timestamp': self._now_iso(),
+        }
+        execution['logs'].append(data)
+        self._append_record(self.execution_file, {'event': 'log', 'id': exec_id, 'data': data})
+        return True
     
     def complete_execution(self, exec_id: str, success: bool = True, notes: str = None):
         """完成执行"""
-        for execution in self.executions:
-            if execution['id'] == exec_id:
-                execution['status'] = 'success' if success else 'failed'
-                execution['completed_at'] = datetime.now().isoformat()
-                if notes:
-                    execution['notes'] = notes
-                self._save_json(self.execution_file, self.executions)
-                
-                # 更新灵感状态
-                idea_id = execution['idea_id']
-                self.update_idea_status(idea_id, 'completed' if success else 'failed', notes)
-                
-                return True
-        return False
+        execution = self._find_exec(exec_id)
+        if execution is None:
+            return False
+        
+        now = self._now_iso()
+        data = {
+            'status': 'success' if success else 'failed',
+            'completed_at': now,
+        }
+        if notes:
+            data['notes'] = notes
+        execution.update(data)
+        self._append_record(self.execution_file, {'event': 'complete', 'id': exec_id, 'data': data})
+        
+        # 更新灵感状态
+        idea_id = execution['idea_id']
+        self.update_idea_status(idea_id, 'completed' if success else 'failed', notes, now=now)
+        
+        return True
     
     # === 收益记录 ===
     
@@ -197,7 +455,7 @@ class AssetPool:
         Returns:
             记录 ID
         """
-        rev_id = f"rev-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        rev_id = self._new_id('rev')
         
         revenue = {
             'id': rev_id,
@@ -205,11 +463,12 @@ class AssetPool:
             'amount': amount,
             'source': source,
             'notes': notes,
-            'recorded_at': datetime.now().isoformat(),
+            'recorded_at': self._now_iso(),
         }
         
         self.revenues.append(revenue)
-        self._save_json(self.revenue_file, self.revenues)
+        self._rev_by_idea[idea_id].append(revenue)
+        self._append_record(self.revenue_file, revenue)
         
         return rev_id
     
@@ -226,7 +485,7 @@ class AssetPool:
         revenues = self.revenues
         
         if idea_id:
-            revenues = [r for r in revenues if r['idea_id'] == idea_id]
+            revenues = self._rev_by_idea.get(idea_id, [])
         
         total = sum(r['amount'] for r in revenues)
         count = len(revenues)
@@ -250,12 +509,13 @@ class AssetPool:
     def get_overview(self) -> Dict:
         """获取资产池概览"""
         # 灵感统计
+        idea_counts = Counter(i.get('status') for i in self.ideas)
         idea_stats = {
             'total': len(self.ideas),
-            'pending': len([i for i in self.ideas if i.get('status') == 'pending']),
-            'in_progress': len([i for i in self.ideas if i.get('status') == 'in_progress']),
-            'completed': len([i for i in self.ideas if i.get('status') == 'completed']),
-            'failed': len([i for i in self.ideas if i.get('status') == 'failed']),
+            'pending': idea_counts['pending'],
+            'in_progress': idea_counts['in_progress'],
+            'completed': idea_counts['completed'],
+            'failed': idea_counts['failed'],
         }
         
         # 成功率
@@ -266,11 +526,12 @@ class AssetPool:
         revenue_stats = self.get_revenue_stats()
         
         # 执行统计
+        exec_counts = Counter(e.get('status') for e in self.executions)
         exec_stats = {
             'total': len(self.executions),
-            'in_progress': len([e for e in self.executions if e.get('status') == 'in_progress']),
-            'success': len([e for e in self.executions if e.get('status') == 'success']),
-            'failed': len([e for e in self.executions if e.get('status') == 'failed']),
+            'in_progress': exec_counts['in_progress'],
+            'success': exec_counts['success'],
+            'failed': exec_counts['failed'],
         }
         
         return {
@@ -298,12 +559,11 @@ if __name__ == '__main__':
     exec_id = pool.start_execution(idea_id)
     print(f"开始执行: {exec_id}")
     
-    # 添加步骤
-    pool.add_execution_step(exec_id, '在闲鱼发布服务')
-    pool.add_execution_step(exec_id, '收到第一个客户咨询')
-    
-    # 完成执行
-    pool.complete_execution(exec_id, success=True, notes='第一个客户成功交付')
+    # 添加步骤并完成执行（批量写盘）
+    with pool.batch():
+        pool.add_execution_step(exec_id, '在闲鱼发布服务')
+        pool.add_execution_step(exec_id, '收到第一个客户咨询')
+        pool.complete_execution(exec_id, success=True, notes='第一个客户成功交付')
     
     # 记录收益
     pool.add_revenue(idea_id, 299, '闲鱼', 'OpenClaw 部署服务')
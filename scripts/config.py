@@ -16,38 +16,38 @@ MIN_STARS = 50
 MIN_WEEKLY_STARS = 20
 
 # 关注的领域（GitHub 搜索关键词）
-CATEGORIES = [
+CATEGORIES = (
     'AI LLM Agent',
     'AI automation',
     'chatbot GPT',
     'AI agent framework',
     'LLM tools',
-]
+)
 
 # 排除的项目（太成熟或无法变现）
-EXCLUDE_KEYWORDS = [
+EXCLUDE_KEYWORDS = (
     'awesome-',  # 资源列表
     'tutorial',  # 教程
     'course',    # 课程
     'book',      # 书籍
-]
+)
 
 # 变现潜力评分规则
 POTENTIAL_RULES = {
     'high': {
         'min_stars': 100,
         'min_weekly_growth': 50,
-        'keywords': ['api', 'sdk', 'framework', 'platform'],
+        'keywords': ('api', 'sdk', 'framework', 'platform'),
     },
     'medium': {
         'min_stars': 50,
         'min_weekly_growth': 20,
-        'keywords': ['tool', 'cli', 'bot'],
+        'keywords': ('tool', 'cli', 'bot'),
     },
     'low': {
         'min_stars': 10,
         'min_weekly_growth': 5,
-        'keywords': [],
+        'keywords': (),
     }
 }
 
@@ -4,21 +4,146 @@
 GitHub 热门项目监控
 """
 
+import heapq
 import requests
 import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from config import GITHUB_TOKEN, CATEGORIES, EXCLUDE_KEYWORDS, MIN_STARS
+from _fastjson import dumps, loads
+
+# Cache-Control 中的 max-age
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# 超过该时间未使用的 ETag 缓存条目在加载时丢弃（秒）
+ETAG_CACHE_EXPIRE = 7 * 24 * 3600
+
+# 排除关键词预编译为一个正则，一次扫描完成匹配
+_EXCLUDE_RE = re.compile('|'.join(re.escape(k.lower()) for k in EXCLUDE_KEYWORDS))
 
 
 class GitHubMonitor:
     """GitHub 热门项目监控"""
     
-    def __init__(self, token: str = GITHUB_TOKEN):
+    def __init__(self, token: str = GITHUB_TOKEN, data_dir: str = None):
         self.token = token
         self.headers = {'Authorization': f'token {token}'} if token else {}
         self.base_url = 'https://api.github.com'
+        # 复用 TCP/TLS 连接；不设置默认请求头，避免把 token 发给第三方 API
+        self.session = requests.Session()
+        # 连接错误和服务端错误重试一次：请求超时 10 秒，两次加退避仍在多数据源的 35 秒等待内。
+        # 限流（429/403）和 Retry-After 要等的时间通常更长，不重试
+        retries = Retry(
+            total=1,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # 非官方 Trending API 只是试探，失败立即降级到搜索 API，不重试
+        self._probe_session = requests.Session()
+        
+        # ETag 缓存：未变化的请求走 304，不重复下载、少占速率限制
+        self.data_dir = data_dir or os.path.expanduser('~/.openclaw/workspace/memory/money-ideas')
+        self.etag_file = os.path.join(self.data_dir, 'etag.json')
+        self._etag_cache = self._load_etag_cache()
+        self._etag_dirty = False
+        self._etag_lock = threading.Lock()
+    
+    def _load_etag_cache(self) -> Dict:
+        """加载 ETag 缓存，丢弃过期条目"""
+        if not os.path.exists(self.etag_file):
+            return {}
+        try:
+            with open(self.etag_file, 'rb') as f:
+                cache = loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        
+        now = time.time()
+        return {k: v for k, v in cache.items() if now - v.get('fetched_at', 0) < ETAG_CACHE_EXPIRE}
+    
+    def _save_etag_cache(self):
+        """保存 ETag 缓存（有更新时），先写临时文件再原子替换"""
+        with self._etag_lock:
+            if not self._etag_dirty:
+                return
+            data = dict(self._etag_cache)
+            self._etag_dirty = False
+        # 每个线程用自己的临时文件，超时未结束的抓取线程同时保存也不会互相覆盖半个文件
+        tmp = f'{self.etag_file}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(dumps(data))
+            os.replace(tmp, self.etag_file)
+        except OSError as e:
+            with self._etag_lock:
+                self._etag_dirty = True
+            print(f"保存 ETag 缓存失败: {e}")
+    
+    def _cached_get(self, url: str, params: Dict = None):
+        """
+        带 ETag / max-age 缓存的 GitHub API GET 请求
+        
+        Args:
+            url: 请求地址
+            params: 查询参数
+            
+        Returns:
+            响应 JSON；请求失败返回 None
+        """
+        key = url
+        if params:
+            key += '?' + '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+        
+        with self._etag_lock:
+            entry = self._etag_cache.get(key)
+        now = time.time()
+        
+        # max-age 内直接使用缓存
+        if entry and now - entry['fetched_at'] < entry.get('max_age', 0):
+            return entry['body']
+        
+        headers = dict(self.headers)
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
+        
+        if response.status_code == 304 and entry:
+            body = entry['body']
+        elif response.status_code == 200:
+            body = response.json()
+        else:
+            return None
+        
+        match = _MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+        max_age = int(match.group(1)) if match else 0
+        etag = response.headers.get('ETag') or (entry or {}).get('etag')
+        if etag or max_age:
+            with self._etag_lock:
+                self._etag_cache[key] = {
+                    'etag': etag,
+                    'body': body,
+                    'fetched_at': now,
+                    'max_age': max_age,
+                }
+                self._etag_dirty = True
+        
+        return body
     
     def search_ai_projects(self, days: int = 7, min_stars: int = MIN_STARS) -> List[Dict]:
         """
@@ -31,52 +156,69 @@ class GitHubMonitor:
         Returns:
             项目列表
         """
-        results = []
-        
         # 计算日期
         since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         
-        for category in CATEGORIES:
-            query = f'{category} created:>{since} stars:>{min_stars}'
-            url = f'{self.base_url}/search/repositories'
-            params = {
-                'q': query,
-                'sort': 'stars',
-                'order': 'desc',
-                'per_page': 20,
+        # 各分类并发搜索，结果按 CATEGORIES 顺序合并，保证输出稳定
+        by_category = {}
+        with ThreadPoolExecutor(max_workers=len(CATEGORIES)) as executor:
+            futures = {
+                executor.submit(self._search_category, category, since, min_stars): category
+                for category in CATEGORIES
             }
-            
-            try:
-                response = requests.get(url, headers=self.headers, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    for item in data.get('items', []):
-                        # 排除不需要的项目
-                        if self._should_exclude(item['full_name'], item.get('description', '')):
-                            continue
-                        
-                        results.append({
-                            'name': item['full_name'],
-                            'stars': item['stargazers_count'],
-                            'language': item.get('language', ''),
-                            'description': item.get('description', ''),
-                            'url': item['html_url'],
-                            'created_at': item['created_at'],
-                            'pushed_at': item['pushed_at'],
-                            'category': category,
-                        })
-            except Exception as e:
-                print(f"搜索失败 ({category}): {e}")
-        
-        # 去重并排序
-        seen = set()
-        unique_results = []
-        for item in sorted(results, key=lambda x: x['stars'], reverse=True):
-            if item['name'] not in seen:
-                seen.add(item['name'])
-                unique_results.append(item)
-        
-        return unique_results[:20]
+            for future in as_completed(futures):
+                by_category[futures[future]] = future.result()
+        
+        self._save_etag_cache()
+        
+        results = []
+        for category in CATEGORIES:
+            results.extend(by_category.get(category, []))
+        
+        # 去重（同名项目保留星标最多的一条）并取前 20
+        merged = {}
+        for item in results:
+            current = merged.get(item['name'])
+            if current is None or item['stars'] > current['stars']:
+                merged[item['name']] = item
+        
+        return heapq.nlargest(20, merged.values(), key=lambda x: x['stars'])
+    
+    def _search_category(self, category: str, since: str, min_stars: int) -> List[Dict]:
+        """搜索单个分类"""
+        results = []
+        
+        query = f'{category} created:>{since} stars:>{min_stars}'
+        url = f'{self.base_url}/search/repositories'
+        params = {
+            'q': query,
+            'sort': 'stars',
+            'order': 'desc',
+            'per_page': 20,
+        }
+        
+        try:
+            data = self._cached_get(url, params)
+            if data is not None:
+                for item in data.get('items', []):
+                    # 排除不需要的项目
+                    if self._should_exclude(item['full_name'], item.get('description', '')):
+                        continue
+                    
+                    results.append({
+                        'name': item['full_name'],
+                        'stars': item['stargazers_count'],
+                        'language': item.get('language', ''),
+                        'description': item.get('description', ''),
+                        'url': item['html_url'],
+                        'created_at': item['created_at'],
+                        'pushed_at': item['pushed_at'],
+                        'category': category,
+                    })
+        except Exception as e:
+            print(f"搜索失败 ({category}): {e}")
+        
+        return results
     
     def get_trending_repos(self, language: str = '', since: str = 'weekly') -> List[Dict]:
         """
@@ -97,7 +239,7 @@ class GitHubMonitor:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._probe_session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 results = []
@@ -122,11 +264,7 @@ class GitHubMonitor:
     
     def _should_exclude(self, name: str, description: str) -> bool:
         """判断是否应该排除"""
-        text = f"{name} {description or ''}".lower()
-        for keyword in EXCLUDE_KEYWORDS:
-            if keyword.lower() in text:
-                return True
-        return False
+        return bool(_EXCLUDE_RE.search(f"{name} {description or ''}".lower()))
     
     def get_repo_details(self, owner: str, repo: str) -> Optional[Dict]:
         """
@@ -142,9 +280,9 @@ class GitHubMonitor:
         url = f'{self.base_url}/repos/{owner}/{repo}'
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._cached_get(url)
+            self._save_etag_cache()
+            if data is not None:
                 return {
                     'name': data['full_name'],
                     'stars': data['stargazers_count'],
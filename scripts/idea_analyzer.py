@@ -6,16 +6,78 @@
 """
 
 import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from config import POTENTIAL_RULES, IDEA_TEMPLATES
 
 
+def _keywords_re(keywords: List[str]):
+    """将关键词列表编译为一个子串匹配正则"""
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+# 潜力评分关键词
+_AI_RE = _keywords_re(['ai', 'llm', 'gpt', 'chatgpt', 'claude', 'agent', 'openai', 'anthropic'])
+_MONETIZATION_RE = _keywords_re([
+    'api', 'sdk', 'cli', 'framework', 'platform', 'tool',
+    'automation', 'chatbot', 'assistant', 'dashboard'
+])
+_LIBRARY_RE = _keywords_re(['library', 'package'])
+_SAAS_RE = _keywords_re(['saas', 'enterprise'])
+_SERVICE_RE = _keywords_re(['api', 'service'])
+_APP_RE = _keywords_re(['tool', 'app'])
+_HOT_LANGUAGES = frozenset(['python', 'typescript', 'rust', 'go'])
+
+# 分档评分表：数值 > 第 i 个阈值时得到第 i+1 档分数
+_STAR_THRESHOLDS = (50, 100, 500, 1000)
+_STAR_SCORES = (10, 15, 20, 25, 30)
+_TRENDING_THRESHOLDS = (10, 20, 50, 100)
+_TRENDING_SCORES = (5, 10, 15, 20, 25)
+
+# 潜力等级：分数 >= 阈值时升一级
+_LEVEL_THRESHOLDS = (50, 70)
+_LEVELS = ('低', '中', '高')
+
+# 变现方式关键词
+_CONSULTING_RE = _keywords_re(['framework', 'platform', 'architecture'])
+_TRAINING_RE = _keywords_re(['tutorial', 'guide', 'learn'])
+_CUSTOMIZATION_RE = _keywords_re(['enterprise', 'business', 'saas', 'api'])
+
+
+# 评分用的项目字段，文本字段已转小写，每个项目只准备一次
+_ProjectView = namedtuple('_ProjectView', ['stars', 'trending_stars', 'language', 'description'])
+
+
+def _prep(project: Dict) -> _ProjectView:
+    """提取评分所需字段并转小写"""
+    return _ProjectView(
+        project.get('stars', 0),
+        project.get('trending_stars', 0),
+        (project.get('language') or '').lower(),
+        (project.get('description') or '').lower(),
+    )
+
+
 class IdeaAnalyzer:
     """赚钱灵感分析器"""
     
     def __init__(self):
         self.templates = IDEA_TEMPLATES
+        # 同一项目可能被多次分析，缓存按项目名格式化好的模板文案
+        self._template_texts = lru_cache(maxsize=512)(self._format_template_texts)
+    
+    def _format_template_texts(self, project_name: str) -> Dict[str, Tuple[str, str]]:
+        """按项目名填充所有模板的名称和描述，返回 {类型: (名称, 描述)}"""
+        return {
+            idea_type: (
+                template['name'].replace('{project_name}', project_name),
+                template['description'].replace('{project_name}', project_name),
+            )
+            for idea_type, template in self.templates.items()
+        }
     
     def analyze_potential(self, project: Dict) -> Tuple[str, float]:
         """
@@ -27,75 +89,59 @@ class IdeaAnalyzer:
         Returns:
             (潜力等级, 潜力分数 0-100)
         """
-        score = 0
+        score = self._score(_prep(project))
+        return _LEVELS[bisect_right(_LEVEL_THRESHOLDS, score)], score
+    
+    def analyze_potential_batch(self, projects: List[Dict]) -> List[Tuple[str, float]]:
+        """
+        批量分析项目的变现潜力
+        
+        Args:
+            projects: 项目列表
+            
+        Returns:
+            与 projects 顺序一致的 (潜力等级, 潜力分数) 列表
+        """
+        views = [_prep(p) for p in projects]
+        score = self._score
+        scores = [score(v) for v in views]
+        return [(_LEVELS[bisect_right(_LEVEL_THRESHOLDS, s)], s) for s in scores]
+    
+    @staticmethod
+    def _score(view: _ProjectView) -> int:
+        """计算潜力分数"""
+        stars, trending_stars, language, description = view
         
         # 1. 星标数评分（最多 30 分）
-        stars = project.get('stars', 0)
-        if stars > 1000:
-            score += 30
-        elif stars > 500:
-            score += 25
-        elif stars > 100:
-            score += 20
-        elif stars > 50:
-            score += 15
-        else:
-            score += 10
+        score = _STAR_SCORES[bisect_left(_STAR_THRESHOLDS, stars)]
         
         # 2. 新增星标速度评分（最多 25 分）
-        trending_stars = project.get('trending_stars', 0)
-        if trending_stars > 100:
-            score += 25
-        elif trending_stars > 50:
-            score += 20
-        elif trending_stars > 20:
-            score += 15
-        elif trending_stars > 10:
-            score += 10
-        else:
-            score += 5
+        score += _TRENDING_SCORES[bisect_left(_TRENDING_THRESHOLDS, trending_stars)]
         
         # 3. 技术栈评分（最多 20 分）
-        language = project.get('language', '').lower()
-        description = project.get('description', '').lower()
-        
         # AI/LLM 相关加分
-        ai_keywords = ['ai', 'llm', 'gpt', 'chatgpt', 'claude', 'agent', 'openai', 'anthropic']
-        if any(k in description for k in ai_keywords):
+        if _AI_RE.search(description):
             score += 15
         
         # 热门语言加分
-        hot_languages = ['python', 'typescript', 'rust', 'go']
-        if language in hot_languages:
+        if language in _HOT_LANGUAGES:
             score += 5
         
         # 4. 变现关键词评分（最多 15 分）
-        monetization_keywords = [
-            'api', 'sdk', 'cli', 'framework', 'platform', 'tool',
-            'automation', 'chatbot', 'assistant', 'dashboard'
-        ]
-        if any(k in description for k in monetization_keywords):
+        if _MONETIZATION_RE.search(description):
             score += 15
-        elif any(k in description for k in ['library', 'package']):
+        elif _LIBRARY_RE.search(description):
             score += 10
         
         # 5. 商业模式评分（最多 10 分）
-        if 'saas' in description or 'enterprise' in description:
+        if _SAAS_RE.search(description):
             score += 10
-        elif 'api' in description or 'service' in description:
+        elif _SERVICE_RE.search(description):
             score += 7
-        elif 'tool' in description or 'app' in description:
+        elif _APP_RE.search(description):
             score += 5
         
-        # 确定潜力等级
-        if score >= 70:
-            potential = '高'
-        elif score >= 50:
-            potential = '中'
-        else:
-            potential = '低'
-        
-        return potential, score
+        return score
     
     def generate_ideas(self, project: Dict, user_preferences: Dict = None) -> List[Dict]:
         """
@@ -113,7 +159,8 @@ class IdeaAnalyzer:
         description = project.get('description', '')
         
         # 分析适合的变现方式
-        suitable_types = self._analyze_suitable_types(project)
+        suitable_types = self._analyze_suitable_types(_prep(project))
+        texts = self._template_texts(project_name)
         
         for idea_type in suitable_types:
             template = self.templates.get(idea_type)
@@ -122,11 +169,12 @@ class IdeaAnalyzer:
             
             # 根据用户偏好调整
             cost, income, time = self._adjust_for_user(template, user_preferences)
+            name, idea_description = texts[idea_type]
             
             idea = {
                 'type': idea_type,
-                'name': template['name'].format(project_name=project_name),
-                'description': template['description'].format(project_name=project_name),
+                'name': name,
+                'description': idea_description,
                 'target_users': template['target_users'],
                 'cost': cost,
                 'expected_income': income,
@@ -139,11 +187,10 @@ class IdeaAnalyzer:
         
         return ideas
     
-    def _analyze_suitable_types(self, project: Dict) -> List[str]:
+    def _analyze_suitable_types(self, view: _ProjectView) -> List[str]:
         """分析项目适合的变现方式"""
-        description = project.get('description', '').lower()
-        language = project.get('language', '').lower()
-        stars = project.get('stars', 0)
+        description = view.description
+        stars = view.stars
         
         suitable = []
         
@@ -152,15 +199,15 @@ class IdeaAnalyzer:
             suitable.append('deployment_service')
         
         # 2. 技术咨询 - 复杂项目适合
-        if any(k in description for k in ['framework', 'platform', 'architecture']):
+        if _CONSULTING_RE.search(description):
             suitable.append('consulting')
         
         # 3. 培训课程 - 有学习门槛的项目适合
-        if any(k in description for k in ['tutorial', 'guide', 'learn']) or stars > 100:
+        if _TRAINING_RE.search(description) or stars > 100:
             suitable.append('training')
         
         # 4. 定制开发 - 企业级项目适合
-        if any(k in description for k in ['enterprise', 'business', 'saas', 'api']):
+        if _CUSTOMIZATION_RE.search(description):
             suitable.append('customization')
         
         # 默认至少返回部署服务和培训
@@ -196,19 +243,16 @@ class IdeaAnalyzer:
     
     def rank_ideas(self, ideas: List[Dict], user_preferences: Dict = None) -> List[Dict]:
         """对灵感进行排序"""
-        def get_score(idea):
-            # 收入越高越好
-            income_score = idea['expected_income'] / 1000
-            
-            # 时间越短越好
-            time_score = 10 / max(idea['time_needed'], 1)
-            
-            # 成本越低越好
-            cost_score = 10 / max(idea['cost'] / 100, 1)
-            
-            return income_score + time_score + cost_score
-        
-        return sorted(ideas, key=get_score, reverse=True)
+        # 先算出整列分数，再按分数对下标排序
+        # 收入越高越好，时间越短越好，成本越低越好
+        scores = [
+            idea['expected_income'] / 1000
+            + 10 / max(idea['time_needed'], 1)
+            + 10 / max(idea['cost'] / 100, 1)
+            for idea in ideas
+        ]
+        order = sorted(range(len(ideas)), key=scores.__getitem__, reverse=True)
+        return [ideas[i] for i in order]
 
 
 # 测试
@@ -5,7 +5,10 @@
 集成资产池 + 多数据源
 """
 
-import json
+import heapq
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -14,6 +17,14 @@ from idea_analyzer import IdeaAnalyzer
 from asset_pool import AssetPool
 from multi_source_monitor import MultiSourceMonitor
 from config import USER_PREFERENCES
+from _fastjson import dumps
+
+# 从 GitHub 项目 URL 中提取 owner/repo
+_GITHUB_URL_RE = re.compile(r'github\.com/([^/]+)/([^/]+)')
+
+# AI 相关项目描述关键词（子串匹配）
+_AI_KEYWORDS = frozenset(['ai', 'llm', 'gpt', 'agent', 'chatbot', 'ml', 'machine learning'])
+_AI_KW_RE = re.compile('|'.join(map(re.escape, sorted(_AI_KEYWORDS))))
 
 
 class MoneyIdeaGenerator:
@@ -21,12 +32,14 @@ class MoneyIdeaGenerator:
     
     def __init__(self, user_preferences: Dict = None):
         self.monitor = GitHubMonitor()
-        self.multi_monitor = MultiSourceMonitor()  # 多数据源
+        # 多数据源，与上面共用同一个 GitHubMonitor（及其 ETag 缓存）
+        self.multi_monitor = MultiSourceMonitor(github_monitor=self.monitor)
         self.analyzer = IdeaAnalyzer()
         self.pool = AssetPool()
         self.preferences = user_preferences or USER_PREFERENCES
     
-    def generate_daily_ideas(self, count: int = 3, save_to_pool: bool = True, use_multi_source: bool = True) -> List[Dict]:
+    def generate_daily_ideas(self, count: int = 3, save_to_pool: bool = True, use_multi_source: bool = True,
+                             parallel: bool = False) -> List[Dict]:
         """
         生成每日赚钱灵感
         
@@ -34,6 +47,7 @@ class MoneyIdeaGenerator:
             count: 灵感数量
             save_to_pool: 是否保存到资产池
             use_multi_source: 是否使用多数据源
+            parallel: 是否用线程池并发分析项目（分析需要联网时才有收益）
             
         Returns:
             赚钱灵感列表
@@ -67,18 +81,23 @@ class MoneyIdeaGenerator:
         
         if projects:
             print("正在分析变现潜力...")
-            analyzed = []
-            for project in projects[:20]:
-                potential, score = self.analyzer.analyze_potential(project)
-                project['potential'] = potential
-                project['potential_score'] = score
-                analyzed.append(project)
-            
-            analyzed.sort(key=lambda x: x['potential_score'], reverse=True)
-            
-            for project in analyzed[:count]:
-                project_ideas = self.analyzer.generate_ideas(project, self.preferences)
-                ideas.extend(project_ideas)
+            if parallel:
+                # executor.map 保持输入顺序
+                with ThreadPoolExecutor(max_workers=10) as executor:
+                    analyzed = list(executor.map(self._analyze_one, projects[:20]))
+                    top_projects = heapq.nlargest(count, analyzed, key=lambda x: x['potential_score'])
+                    for project_ideas in executor.map(self._generate_for_project, top_projects):
+                        ideas.extend(project_ideas)
+            else:
+                analyzed = projects[:20]
+                for project, (potential, score) in zip(analyzed, self.analyzer.analyze_potential_batch(analyzed)):
+                    project['potential'] = potential
+                    project['potential_score'] = score
+                
+                top_projects = heapq.nlargest(count, analyzed, key=lambda x: x['potential_score'])
+                
+                for project in top_projects:
+                    ideas.extend(self._generate_for_project(project))
         
         # 3. 如果没有数据，使用备用灵感
         if not ideas:
@@ -95,6 +114,17 @@ class MoneyIdeaGenerator:
         
         return final_ideas
     
+    def _analyze_one(self, project: Dict) -> Dict:
+        """分析单个项目的变现潜力，结果写回项目信息"""
+        potential, score = self.analyzer.analyze_potential(project)
+        project['potential'] = potential
+        project['potential_score'] = score
+        return project
+    
+    def _generate_for_project(self, project: Dict) -> List[Dict]:
+        """按用户偏好为单个项目生成灵感"""
+        return self.analyzer.generate_ideas(project, self.preferences)
+    
     def analyze_project(self, project_url: str) -> Optional[Dict]:
         """
         分析特定项目的变现潜力
@@ -106,8 +136,7 @@ class MoneyIdeaGenerator:
             分析结果
         """
         # 从 URL 提取 owner/repo
-        import re
-        match = re.search(r'github\.com/([^/]+)/([^/]+)', project_url)
+        match = _GITHUB_URL_RE.search(project_url)
         if not match:
             return None
         
@@ -145,21 +174,18 @@ class MoneyIdeaGenerator:
         trending = self.monitor.get_trending_repos(language='', since='weekly')
         
         # 筛选 AI 相关项目
-        ai_keywords = ['ai', 'llm', 'gpt', 'agent', 'chatbot', 'ml', 'machine learning']
         ai_projects = []
         
         for project in trending:
             desc = project.get('description', '').lower()
-            if any(k in desc for k in ai_keywords):
+            if _AI_KW_RE.search(desc):
                 potential, score = self.analyzer.analyze_potential(project)
                 project['potential'] = potential
                 project['potential_score'] = score
                 ai_projects.append(project)
         
-        # 排序
-        ai_projects.sort(key=lambda x: x['potential_score'], reverse=True)
-        
-        return ai_projects[:10]
+        # 取潜力最高的 10 个
+        return heapq.nlargest(10, ai_projects, key=lambda x: x['potential_score'])
     
     def _get_fallback_ideas(self) -> List[Dict]:
         """获取备用灵感（当无法获取数据时）"""
@@ -217,32 +243,37 @@ class MoneyIdeaGenerator:
 
 def format_idea_output(ideas: List[Dict]) -> str:
     """格式化输出灵感"""
-    output = []
-    output.append("=" * 60)
-    output.append("💰 今日赚钱灵感")
-    output.append("=" * 60)
-    output.append(f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    output.append("")
+    buf = io.StringIO()
+    write = buf.write
+    
+    write("=" * 60 + "\n")
+    write("💰 今日赚钱灵感\n")
+    write("=" * 60 + "\n")
+    write(f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    write("\n")
     
     for i, idea in enumerate(ideas, 1):
-        output.append(f"【灵感 #{i}】{idea['name']}")
-        output.append(f"  描述：{idea['description']}")
-        output.append(f"  目标用户：{', '.join(idea['target_users'])}")
-        output.append(f"  启动成本：¥{idea['cost']}")
-        output.append(f"  预期收入：¥{idea['expected_income']}/月")
-        output.append(f"  所需时间：{idea['time_needed']} 天")
+        write(
+            f"【灵感 #{i}】{idea['name']}\n"
+            f"  描述：{idea['description']}\n"
+            f"  目标用户：{', '.join(idea['target_users'])}\n"
+            f"  启动成本：¥{idea['cost']}\n"
+            f"  预期收入：¥{idea['expected_income']}/月\n"
+            f"  所需时间：{idea['time_needed']} 天\n"
+        )
         
         if 'implementation' in idea:
-            output.append("  实现路径：")
+            write("  实现路径：\n")
             for step in idea['implementation']:
-                output.append(f"    - {step}")
+                write(f"    - {step}\n")
         
         if 'project_url' in idea:
-            output.append(f"  🔗 {idea['project_url']}")
+            write(f"  🔗 {idea['project_url']}\n")
         
-        output.append("")
+        write("\n")
     
-    return "\n".join(output)
+    # 与逐行拼接的旧实现保持一致：末尾不带换行
+    return buf.getvalue()[:-1]
 
 
 # 主入口
@@ -256,4 +287,4 @@ if __name__ == '__main__':
     print("\n=== 测试：分析特定项目 ===\n")
     result = generator.analyze_project('https://github.com/langchain-ai/langchain')
     if result:
-        print(json.dumps(result, indent=2, ensure_ascii=False))
\ No newline at end of file
+        print(dumps(result, indent=True).decode('utf-8'))
\ No newline at end of file
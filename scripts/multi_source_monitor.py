@@ -5,49 +5,313 @@
 整合 GitHub、抖音、B站、小红书、Twitter
 """
 
+import asyncio
+import atexit
+import functools
+import heapq
 import json
+import os
+import random
+import re
+import signal
 import subprocess
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from _fastjson import dumps, loads
+
+# 热点缓存有效期（秒）
+HOT_CACHE_TTL = 3600
+
+# 所有监控器实例（弱引用），退出时统一保存缓存
+_MONITORS = weakref.WeakSet()
+
+
+@atexit.register
+def _save_all_caches():
+    """退出时保存所有监控器的热点缓存"""
+    for monitor in list(_MONITORS):
+        monitor._save_cache()
+
+
+@functools.lru_cache(maxsize=None)
+def _github_monitor():
+    """
+    共享的 GitHubMonitor
+    
+    首次使用时才导入 github_monitor（及 requests），之后复用同一实例
+    及其 HTTP 连接和 ETag 缓存。
+    """
+    from github_monitor import GitHubMonitor
+    return GitHubMonitor()
+
+
+class _BirdError(Exception):
+    """bird 命令执行失败（非零退出码），可以重试"""
+
+
+def retry(times: int = 3, base: float = 0.5, jitter: bool = True, exceptions=(Exception,),
+          budget: float = None):
+    """
+    失败重试，指数退避
+    
+    第 n 次失败后等待 base * 2**n 秒（jitter 时再加 0-0.1 秒随机量）；
+    只重试 exceptions 中的异常，最后一次仍失败则抛出。
+    
+    指定 budget 时，所有尝试加等待总共不超过 budget 秒（调用方传了 timeout
+    关键字参数则以它为准）：每次调用以 timeout 关键字参数传入剩余时间，
+    剩余时间不够再等一轮时直接抛出。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            total = kwargs.get('timeout', budget) if budget is not None else None
+            deadline = time.monotonic() + total if total is not None else None
+            for attempt in range(times):
+                if deadline is not None:
+                    kwargs['timeout'] = deadline - time.monotonic()
+                try:
+                    return func(*args, **kwargs)
+                except exceptions:
+                    if attempt == times - 1:
+                        raise
+                    delay = base * 2 ** attempt
+                    if jitter:
+                        delay += random.random() * 0.1
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        raise
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+
+def ttl_cache(seconds: int):
+    """
+    缓存数据源方法的结果
+    
+    结果按方法名存入实例的 _cache，seconds 秒内重复调用直接返回缓存；
+    调用时传 force_refresh=True 跳过缓存。空结果（抓取失败）不缓存。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, force_refresh: bool = False):
+            key = func.__name__
+            entry = self._cache.get(key)
+            now = time.time()
+            if not force_refresh and entry and now - entry[0] < seconds:
+                return entry[1]
+            
+            value = func(self)
+            if value:
+                self._cache[key] = (now, value)
+                self._cache_dirty = True
+            return value
+        return wrapper
+    return decorator
+
 
 class MultiSourceMonitor:
     """多数据源监控器"""
     
-    def __init__(self):
-        self.sources = ['github', 'douyin', 'bilibili', 'xiaohongshu', 'twitter']
+    # 数据源
+    _SOURCES = ('github', 'douyin', 'bilibili', 'xiaohongshu', 'twitter')
+    
+    # 抖音 / 小红书热门话题
+    _DOUYIN_TOPICS = ('AI赚钱', '副业', '创业', 'AI工具')
+    _XIAOHONGSHU_TOPICS = ('AI赚钱', '副业', '创业', '自媒体')
+    
+    # AI 相关关键词（filter_ai_related 使用）
+    _AI_KEYWORDS = frozenset([
+        'ai', 'artificial intelligence', '人工智能',
+        'llm', 'gpt', 'chatgpt', 'claude',
+        'agent', '智能体', '自动化',
+        'machine learning', 'deep learning',
+        'nlp', 'computer vision',
+    ])
+    # 合成一个正则，一次扫描判断是否包含任一关键词
+    _AI_KEYWORD_RE = re.compile('|'.join(map(re.escape, sorted(_AI_KEYWORDS))))
+    
+    # 变现潜力关键词及分值：赚钱类 20、AI 类 15、工具类 10
+    _KEYWORD_SCORES = {
+        **dict.fromkeys(['赚钱', '副业', '创业', '变现', '商业化', '盈利'], 20),
+        **dict.fromkeys(['ai', '人工智能', 'gpt', 'agent', '自动化'], 15),
+        **dict.fromkeys(['工具', '平台', '系统', '软件', 'app'], 10),
+    }
+    # (关键词, 分值) 元组：标题加描述很短，逐个子串查找比正则 findall 再去重更快
+    _KEYWORD_ITEMS = tuple(_KEYWORD_SCORES.items())
+    
+    # 数据源加分：GitHub 项目更容易变现，B站科技区有参考价值
+    _SOURCE_BONUS = {'github': 15, 'bilibili': 10}
+    
+    # 标题归一化（去掉标点和空白）后用于跨平台去重
+    _NON_WORD_RE = re.compile(r'\W+')
+    
+    # Twitter（bird）抓取的总时长上限（秒），包括重试
+    BIRD_TIMEOUT = 30
+    
+    # 等待所有数据源返回的最长时间（秒），需覆盖 BIRD_TIMEOUT 和 HTTP 请求的重试
+    SOURCE_TIMEOUT = 35
+    
+    def __init__(self, data_dir: str = None, github_monitor=None):
+        """
+        Args:
+            data_dir: 热点缓存目录
+            github_monitor: 使用的 GitHubMonitor，不传时使用模块内共享的实例
+        """
+        self.sources = self._SOURCES
+        self._github = github_monitor
+        
+        # 热点缓存，跨进程共享，退出时写盘
+        self.data_dir = data_dir or os.path.expanduser('~/.openclaw/workspace/memory/money-ideas')
+        self.cache_file = os.path.join(self.data_dir, 'hot_cache.json')
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+        _MONITORS.add(self)
+        
+        # 共享的 HTTP 会话，首次请求时创建
+        self._http = None
+    
+    @property
+    def github(self):
+        """GitHubMonitor（未指定时首次使用才创建）"""
+        if self._github is None:
+            self._github = _github_monitor()
+        return self._github
+    
+    @property
+    def http(self):
+        """复用连接（keep-alive）的 requests 会话"""
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            })
+            # 连接错误和服务端错误重试一次：请求超时 10 秒，两次加退避仍在 SOURCE_TIMEOUT 内。
+            # 限流（429）和 Retry-After 要等的时间通常超过 SOURCE_TIMEOUT，不重试
+            retries = Retry(
+                total=1,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._http = session
+        return self._http
+    
+    def _load_cache(self) -> Dict:
+        """加载热点缓存"""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = loads(f.read())
+        except (OSError, ValueError):
+            # 文件不存在或损坏（含截断在多字节字符中间的 UnicodeDecodeError）
+            return {}
+        try:
+            return {key: (ts, value) for key, (ts, value) in data.items()}
+        except (AttributeError, TypeError, ValueError):
+            # 格式不对的缓存直接丢弃
+            return {}
+    
+    def _save_cache(self):
+        """保存热点缓存（有更新时），先写临时文件再原子替换"""
+        if not self._cache_dirty:
+            return
+        self._cache_dirty = False
+        tmp = f'{self.cache_file}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(dumps(dict(self._cache)))
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            self._cache_dirty = True
+            print(f"保存热点缓存失败: {e}")
     
-    def get_all_hot(self) -> Dict[str, List[Dict]]:
+    def get_all_hot(self, force_refresh: bool = False) -> Dict[str, List[Dict]]:
         """
         获取所有平台热点
         
+        各平台并发抓取，总耗时取决于最慢的数据源；
+        单个数据源失败或超时只会让该平台结果为空。
+        
+        Args:
+            force_refresh: 跳过缓存，重新抓取
+            
         Returns:
             各平台热点数据
         """
-        results = {}
+        fetchers = {
+            'github': self._get_github_trending,       # GitHub 热门
+            'douyin': self._get_douyin_hot,            # 抖音热门
+            'bilibili': self._get_bilibili_hot,        # B站热门
+            'xiaohongshu': self._get_xiaohongshu_hot,  # 小红书热门
+            'twitter': self._get_twitter_ai,           # Twitter AI trending
+        }
         
-        # GitHub 热门
-        results['github'] = self._get_github_trending()
+        executor = ThreadPoolExecutor(max_workers=len(fetchers))
+        futures = {source: executor.submit(fetch, force_refresh) for source, fetch in fetchers.items()}
+        deadline = time.monotonic() + self.SOURCE_TIMEOUT
         
-        # 抖音热门
-        results['douyin'] = self._get_douyin_hot()
-        
-        # B站热门
-        results['bilibili'] = self._get_bilibili_hot()
+        results = {}
+        try:
+            for source, future in futures.items():
+                try:
+                    results[source] = future.result(timeout=max(0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    print(f"{source} 数据获取超时")
+                    results[source] = []
+                except Exception as e:
+                    print(f"{source} 数据获取失败: {e}")
+                    results[source] = []
+        finally:
+            # 不等待超时的数据源
+            executor.shutdown(wait=False)
         
-        # 小红书热门
-        results['xiaohongshu'] = self._get_xiaohongshu_hot()
+        self._save_cache()
         
-        # Twitter AI trending
-        results['twitter'] = self._get_twitter_ai()
+        # Twitter 备用数据：在缓存之外补上，抓取失败不会被缓存
+        if not results['twitter']:
+            results['twitter'] = self._with_text([{
+                'source': 'twitter',
+                'title': 'AI trending on Twitter',
+                'description': 'Twitter AI trending 搜索',
+                'url': 'https://twitter.com/search?q=AI%20trending',
+                'metrics': {},
+                'tags': ['AI', 'Twitter'],
+            }])
         
         return results
     
+    async def get_all_hot_async(self, force_refresh: bool = False) -> Dict[str, List[Dict]]:
+        """
+        get_all_hot 的 asyncio 版本，供运行在事件循环中的调用方使用
+        
+        抓取在线程池中进行，不会阻塞事件循环。
+        
+        Args:
+            force_refresh: 跳过缓存，重新抓取
+            
+        Returns:
+            各平台热点数据
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.get_all_hot, force_refresh))
+    
+    @ttl_cache(HOT_CACHE_TTL)
     def _get_github_trending(self) -> List[Dict]:
         """获取 GitHub Trending AI 项目"""
-        from github_monitor import GitHubMonitor
-        monitor = GitHubMonitor()
-        projects = monitor.search_ai_projects(days=7, min_stars=50)
+        projects = self.github.search_ai_projects(days=7, min_stars=50)
         
         results = []
         for p in projects[:10]:
@@ -62,8 +326,9 @@ class MultiSourceMonitor:
                 'tags': ['AI', 'GitHub'],
             })
         
-        return results
+        return self._with_text(results)
     
+    @ttl_cache(HOT_CACHE_TTL)
     def _get_douyin_hot(self) -> List[Dict]:
         """获取抖音热门"""
         results = []
@@ -71,9 +336,7 @@ class MultiSourceMonitor:
         try:
             # 使用 bird CLI 获取抖音数据
             # 热门话题：AI、赚钱、副业、创业
-            topics = ['AI赚钱', '副业', '创业', 'AI工具']
-            
-            for topic in topics:
+            for topic in self._DOUYIN_TOPICS:
                 try:
                     # 这里可以调用抖音 MCP 或其他方式
                     # 暂时返回示例数据
@@ -91,26 +354,22 @@ class MultiSourceMonitor:
         except Exception as e:
             print(f"抖音数据获取失败: {e}")
         
-        return results[:5]
+        return self._with_text(results[:5])
     
+    @ttl_cache(HOT_CACHE_TTL)
     def _get_bilibili_hot(self) -> List[Dict]:
         """获取 B站热门"""
         results = []
         
         try:
             # B站科技区热门
-            import requests
-            
             url = 'https://api.bilibili.com/x/web-interface/ranking/v2'
             params = {'rid': 36, 'type': 'all'}  # 36 = 科技区
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': 'https://www.bilibili.com/',
-            }
+            headers = {'Referer': 'https://www.bilibili.com/'}
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = self.http.get(url, params=params, headers=headers, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = loads(response.content)
                 for item in data.get('data', {}).get('list', [])[:10]:
                     results.append({
                         'source': 'bilibili',
@@ -126,16 +385,15 @@ class MultiSourceMonitor:
         except Exception as e:
             print(f"B站数据获取失败: {e}")
         
-        return results
+        return self._with_text(results)
     
+    @ttl_cache(HOT_CACHE_TTL)
     def _get_xiaohongshu_hot(self) -> List[Dict]:
         """获取小红书热门"""
         results = []
         
         # 小红书 API 需要登录，暂时使用搜索方式
-        topics = ['AI赚钱', '副业', '创业', '自媒体']
-        
-        for topic in topics:
+        for topic in self._XIAOHONGSHU_TOPICS:
             results.append({
                 'source': 'xiaohongshu',
                 'title': f'{topic}相关热门笔记',
@@ -145,123 +403,185 @@ class MultiSourceMonitor:
                 'tags': [topic, '小红书'],
             })
         
-        return results[:5]
+        return self._with_text(results[:5])
     
+    @ttl_cache(HOT_CACHE_TTL)
     def _get_twitter_ai(self) -> List[Dict]:
         """获取 Twitter AI trending"""
         results = []
         
         try:
-            # 使用 bird CLI 搜索
-            result = subprocess.run(
-                ['bird', 'search', 'AI trending', '--limit', '10'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                # 解析 bird 输出
-                lines = result.stdout.strip().split('\n')
-                for line in lines[:10]:
-                    if line.strip():
-                        results.append({
-                            'source': 'twitter',
-                            'title': line[:100],
-                            'description': line,
-                            'url': 'https://twitter.com/search?q=AI',
-                            'metrics': {},
-                            'tags': ['AI', 'Twitter'],
-                        })
+            for line in self._search_bird('AI trending', limit=10):
+                results.append({
+                    'source': 'twitter',
+                    'title': line[:100],
+                    'description': line,
+                    'url': 'https://twitter.com/search?q=AI',
+                    'metrics': {},
+                    'tags': ['AI', 'Twitter'],
+                })
         except Exception as e:
             print(f"Twitter 数据获取失败: {e}")
         
-        # 备用数据
-        if not results:
-            results.append({
-                'source': 'twitter',
-                'title': 'AI trending on Twitter',
-                'description': 'Twitter AI trending 搜索',
-                'url': 'https://twitter.com/search?q=AI%20trending',
-                'metrics': {},
-                'tags': ['AI', 'Twitter'],
-            })
+        return self._with_text(results)
+    
+    @retry(times=3, base=0.5, exceptions=(_BirdError,), budget=BIRD_TIMEOUT)
+    def _search_bird(self, query: str, limit: int = 10, *, timeout: float = BIRD_TIMEOUT) -> List[str]:
+        """
+        用 bird CLI 搜索
         
-        return results
+        边读边解析，拿到 limit 条就结束；超过 timeout 秒终止并返回空列表。
+        
+        Args:
+            query: 搜索词
+            limit: 最多返回的条数
+            timeout: 总等待时间上限（秒），包括重试
+            
+        Returns:
+            非空输出行
+        """
+        lines = []
+        proc = subprocess.Popen(
+            ['bird', 'search', query, '--limit', str(limit)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            start_new_session=True,
+        )
+        timer = threading.Timer(max(0, timeout), self._kill_process, (proc,))
+        timer.start()
+        try:
+            for line in proc.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                lines.append(line)
+                if len(lines) >= limit:
+                    break
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+            if len(lines) >= limit:
+                # 已拿够，不再等待剩余输出
+                self._kill_process(proc)
+            try:
+                returncode = proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._kill_process(proc)
+                returncode = proc.wait()
+        
+        # 读完了全部输出但命令失败，结果不可信
+        if len(lines) < limit and returncode != 0:
+            if returncode > 0:
+                raise _BirdError(f"bird 退出码 {returncode}")
+            # 被超时终止，不再重试
+            return []
+        
+        return lines
+    
+    @staticmethod
+    def _with_text(items: List[Dict]) -> List[Dict]:
+        """为每个条目缓存小写的“标题 描述”文本（_text_lc），筛选和评分直接复用"""
+        for item in items:
+            item['_text_lc'] = f"{item['title']} {item['description']}".lower()
+        return items
+    
+    @staticmethod
+    def _item_text(item: Dict) -> str:
+        """条目小写的“标题 描述”文本，没有缓存时现算"""
+        text = item.get('_text_lc')
+        if text is None:
+            text = f"{item.get('title', '')} {item.get('description', '')}".lower()
+        return text
+    
+    @staticmethod
+    def _kill_process(proc: subprocess.Popen):
+        """结束子进程及其派生的进程（POSIX 下按进程组结束）"""
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except AttributeError:
+            # Windows 没有进程组信号
+            proc.kill()
+        except OSError:
+            # 进程已退出
+            pass
     
     def filter_ai_related(self, items: List[Dict]) -> List[Dict]:
         """筛选 AI 相关内容"""
-        ai_keywords = [
-            'ai', 'artificial intelligence', '人工智能',
-            'llm', 'gpt', 'chatgpt', 'claude',
-            'agent', '智能体', '自动化',
-            'machine learning', 'deep learning',
-            'nlp', 'computer vision',
-        ]
+        ai_keyword_re = self._AI_KEYWORD_RE
+        item_text = self._item_text
         
         filtered = []
         for item in items:
-            text = f"{item.get('title', '')} {item.get('description', '')}".lower()
-            if any(k in text for k in ai_keywords):
+            if ai_keyword_re.search(item_text(item)):
                 filtered.append(item)
         
         return filtered
     
-    def generate_ideas_from_hot(self, hot_data: Dict) -> List[Dict]:
-        """从热点数据生成赚钱灵感"""
+    def generate_ideas_from_hot(self, hot_data: Dict[str, List[Dict]]) -> List[Dict]:
+        """
+        从热点数据生成赚钱灵感
+        
+        Args:
+            hot_data: get_all_hot 返回的各平台热点
+            
+        Returns:
+            灵感列表（dict），按潜力从高到低
+        """
         ideas = []
         
+        # 同一内容可能出现在多个平台：按归一化标题去重，
+        # 先出现的保留，后出现的数据源加分更高时替换
+        unique = {}
+        source_bonus = self._SOURCE_BONUS
         for source, items in hot_data.items():
             for item in items:
-                # 简单判断是否有变现潜力
-                potential = self._analyze_potential(item)
-                if potential > 0:
-                    ideas.append({
-                        'source': source,
-                        'title': item.get('title', ''),
-                        'description': item.get('description', ''),
-                        'url': item.get('url', ''),
-                        'potential': potential,
-                        'tags': item.get('tags', []),
-                    })
+                key = self._NON_WORD_RE.sub('', item.get('title', '').lower())[:40]
+                if not key:
+                    # 没有标题的条目无法判断是否重复，全部保留
+                    key = id(item)
+                current = unique.get(key)
+                if current is None or source_bonus.get(source, 0) > source_bonus.get(current[0], 0):
+                    unique[key] = (source, item)
+        
+        # 所有平台的条目一次性批量评分
+        entries = list(unique.values())
+        scores = self._analyze_potential_batch([item for _, item in entries])
         
-        # 按潜力排序
-        ideas.sort(key=lambda x: x['potential'], reverse=True)
+        for (source, item), potential in zip(entries, scores):
+            # 简单判断是否有变现潜力
+            if potential > 0:
+                ideas.append({
+                    'source': source,
+                    'title': item.get('title', ''),
+                    'description': item.get('description', ''),
+                    'url': item.get('url', ''),
+                    'potential': potential,
+                    'tags': item.get('tags', []),
+                })
         
-        return ideas[:10]
+        # 取潜力最高的 10 个
+        return heapq.nlargest(10, ideas, key=lambda x: x['potential'])
     
     def _analyze_potential(self, item: Dict) -> int:
         """分析变现潜力（0-100）"""
-        score = 0
-        
-        title = item.get('title', '').lower()
-        desc = item.get('description', '').lower()
-        text = f"{title} {desc}"
-        
-        # 关键词加分
-        money_keywords = ['赚钱', '副业', '创业', '变现', '商业化', '盈利']
-        for k in money_keywords:
-            if k in text:
-                score += 20
-        
-        ai_keywords = ['ai', '人工智能', 'gpt', 'agent', '自动化']
-        for k in ai_keywords:
-            if k in text:
-                score += 15
-        
-        tool_keywords = ['工具', '平台', '系统', '软件', 'app']
-        for k in tool_keywords:
-            if k in text:
-                score += 10
-        
-        # 数据源加分
-        source = item.get('source', '')
-        if source == 'github':
-            score += 15  # GitHub 项目更容易变现
-        elif source == 'bilibili':
-            score += 10  # B站科技区有参考价值
-        
-        return min(score, 100)
+        return self._analyze_potential_batch([item])[0]
+    
+    def _analyze_potential_batch(self, items: List[Dict]) -> List[int]:
+        """批量分析变现潜力（0-100），返回与 items 顺序一致的分数"""
+        keyword_items = self._KEYWORD_ITEMS
+        source_bonus = self._SOURCE_BONUS
+        item_text = self._item_text
+        
+        scores = []
+        for item in items:
+            # 关键词加分（每个关键词只计一次）+ 数据源加分
+            text = item_text(item)
+            score = sum([points for k, points in keyword_items if k in text])
+            score += source_bonus.get(item.get('source', ''), 0)
+            scores.append(min(score, 100))
+        
+        return scores
 
 
 # 测试